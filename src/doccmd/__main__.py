@@ -4,5 +4,6 @@ Enable running `doccmd` with `python -m doccmd`.
 
 from doccmd import main
 
-if __name__ == "__main__":
+# This module is only ever run as ``__main__``.
+if __name__ == "__main__":  # pragma: no branch
     main()
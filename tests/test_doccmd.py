@@ -2,28 +2,173 @@
 Tests for `doccmd`.
 """
 
-import stat
-import subprocess
+import runpy
 import sys
 import textwrap
 import uuid
 from collections.abc import Sequence
 from pathlib import Path
 
+import click
 import pytest
 from click.testing import CliRunner
 from pytest_regressions.file_regression import FileRegressionFixture
 
 from doccmd import main
 
+_PYTHON_EXECUTABLE = Path(sys.executable).as_posix()
 
-def test_help(file_regression: FileRegressionFixture) -> None:
+
+_PYTHON_BLOCK_RST_CONTENT = """\
+    .. code-block:: python
+
+        x = 2 + 2
+        assert x == 4
+    """
+
+# The file is padded so that any error messages relate to the correct line
+# number in the original file.
+_PYTHON_BLOCK_PADDED_OUTPUT = textwrap.dedent(
+    text="""\
+
+
+    x = 2 + 2
+    assert x == 4
+    """,
+)
+
+# A document with one code block, used by tests which check how files are
+# recognized rather than what is run.
+_X_EQUALS_1_RST_CONTENT = """\
+    .. code-block:: python
+
+        x = 1
+    """
+
+# A script which reports whether its standard output is a terminal.
+_TTY_TEST_SCRIPT = textwrap.dedent(
+    text="""\
+    import sys
+
+    if sys.stdout.isatty():
+        print("stdout is a terminal.")
+    else:
+        print("stdout is not a terminal.")
+    """,
+)
+
+# Documents in which the second code block is skipped by a
+# ``skip doccmd[...]: next`` comment using the marker given as
+# ``skip_marker``, to be filled in with ``str.format``.
+_RST_SKIP_NEXT_TEMPLATE = """\
+    .. code-block:: python
+
+       block_1
+
+    .. skip doccmd[{skip_marker}]: next
+
+    .. code-block:: python
+
+        block_2
+
+    .. code-block:: python
+
+        block_3
+    """
+
+_MYST_SKIP_NEXT_TEMPLATE = """\
+    Example
+
+    ```python
+    block_1
+    ```
+
+    <!--- skip doccmd[{skip_marker}]: next -->
+
+    ```python
+    block_2
+    ```
+
+    ```python
+    block_3
+    ```
+
+    % skip doccmd[{skip_marker}]: next
+
+    ```python
+    block_4
+    ```
+    """
+
+# The unpadded output of ``cat`` on the non-skipped blocks of a document made
+# from one of the skip templates.
+_SKIP_NEXT_OUTPUT = textwrap.dedent(
+    text="""\
+    block_1
+    block_3
+    """,
+)
+
+
+@pytest.fixture(name="runner", scope="session")
+def fixture_runner() -> CliRunner:
+    """
+    A runner for invoking the CLI.
+
+    ``CliRunner.invoke`` does not keep state between calls, so a single
+    runner is shared between tests.
+    """
+    return CliRunner(mix_stderr=False)
+
+
+@pytest.fixture(name="python_block_rst_file", scope="session")
+def fixture_python_block_rst_file(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> Path:
+    """
+    A reStructuredText file with a single Python code block.
+
+    ``cat`` and ``echo`` do not change the document, so tests which run them
+    on it can use the same file.
+    """
+    rst_file = tmp_path_factory.mktemp(basename="python_block") / "example.rst"
+    rst_file.write_text(data=_PYTHON_BLOCK_RST_CONTENT, encoding="utf-8")
+    return rst_file
+
+
+@pytest.fixture(name="empty_rst_file", scope="session")
+def fixture_empty_rst_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """
+    An empty reStructuredText file.
+
+    Tests which need a document path but no code blocks can share this.
+    """
+    rst_file = tmp_path_factory.mktemp(basename="empty") / "example.rst"
+    rst_file.touch()
+    return rst_file
+
+
+@pytest.fixture(name="tty_test_script", scope="session")
+def fixture_tty_test_script(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """
+    A script which reports whether its standard output is a terminal.
+
+    The script is only ever run, so one copy serves every ``test_pty`` case.
+    """
+    script = tmp_path_factory.mktemp(basename="scripts") / "my_script.py"
+    script.write_text(data=_TTY_TEST_SCRIPT)
+    return script
+
+
+def test_help(
+    file_regression: FileRegressionFixture,
+    runner: CliRunner,
+) -> None:
     """Expected help text is shown.
 
     This help text is defined in files.
     To update these files, run ``pytest`` with the ``--regen-all`` flag.
     """
-    runner = CliRunner(mix_stderr=False)
     arguments = ["--help"]
     result = runner.invoke(
         cli=main,
@@ -34,25 +179,16 @@ def test_help(file_regression: FileRegressionFixture) -> None:
     file_regression.check(contents=result.output)
 
 
-def test_run_command(tmp_path: Path) -> None:
+def test_run_command(python_block_rst_file: Path, runner: CliRunner) -> None:
     """
     It is possible to run a command against a code block in a document.
     """
-    runner = CliRunner(mix_stderr=False)
-    rst_file = tmp_path / "example.rst"
-    content = """\
-    .. code-block:: python
-
-        x = 2 + 2
-        assert x == 4
-    """
-    rst_file.write_text(data=content, encoding="utf-8")
     arguments = [
         "--language",
         "python",
         "--command",
         "cat",
-        str(object=rst_file),
+        str(object=python_block_rst_file),
     ]
     result = runner.invoke(
         cli=main,
@@ -60,34 +196,17 @@ def test_run_command(tmp_path: Path) -> None:
         catch_exceptions=False,
     )
     assert result.exit_code == 0, (result.stdout, result.stderr)
-    expected_output = textwrap.dedent(
-        # The file is padded so that any error messages relate to the correct
-        # line number in the original file.
-        text="""\
-
-
-        x = 2 + 2
-        assert x == 4
-        """,
-    )
-
-    assert result.stdout == expected_output
+    assert result.stdout == _PYTHON_BLOCK_PADDED_OUTPUT
     assert result.stderr == ""
 
 
-def test_double_language(tmp_path: Path) -> None:
+def test_double_language(
+    python_block_rst_file: Path,
+    runner: CliRunner,
+) -> None:
     """
     Giving the same language twice does not run the command twice.
     """
-    runner = CliRunner(mix_stderr=False)
-    rst_file = tmp_path / "example.rst"
-    content = """\
-    .. code-block:: python
-
-        x = 2 + 2
-        assert x == 4
-    """
-    rst_file.write_text(data=content, encoding="utf-8")
     arguments = [
         "--language",
         "python",
@@ -95,7 +214,7 @@ def test_double_language(tmp_path: Path) -> None:
         "python",
         "--command",
         "cat",
-        str(object=rst_file),
+        str(object=python_block_rst_file),
     ]
     result = runner.invoke(
         cli=main,
@@ -103,26 +222,14 @@ def test_double_language(tmp_path: Path) -> None:
         catch_exceptions=False,
     )
     assert result.exit_code == 0, (result.stdout, result.stderr)
-    expected_output = textwrap.dedent(
-        # The file is padded so that any error messages relate to the correct
-        # line number in the original file.
-        text="""\
-
-
-        x = 2 + 2
-        assert x == 4
-        """,
-    )
-
-    assert result.stdout == expected_output
+    assert result.stdout == _PYTHON_BLOCK_PADDED_OUTPUT
     assert result.stderr == ""
 
 
-def test_file_does_not_exist() -> None:
+def test_file_does_not_exist(runner: CliRunner) -> None:
     """
     An error is shown when a file does not exist.
     """
-    runner = CliRunner(mix_stderr=False)
     arguments = [
         "--language",
         "python",
@@ -139,11 +246,10 @@ def test_file_does_not_exist() -> None:
     assert "Path 'non_existent_file.rst' does not exist" in result.stderr
 
 
-def test_not_utf_8_file_given(tmp_path: Path) -> None:
+def test_not_utf_8_file_given(tmp_path: Path, runner: CliRunner) -> None:
     """
     No error is given if a file is passed in which is not UTF-8.
     """
-    runner = CliRunner(mix_stderr=False)
     rst_file = tmp_path / "example.rst"
     content = """\
     .. code-block:: python
@@ -169,11 +275,10 @@ def test_not_utf_8_file_given(tmp_path: Path) -> None:
     assert result.stderr == ""
 
 
-def test_multiple_code_blocks(tmp_path: Path) -> None:
+def test_multiple_code_blocks(tmp_path: Path, runner: CliRunner) -> None:
     """
     It is possible to run a command against multiple code blocks in a document.
     """
-    runner = CliRunner(mix_stderr=False)
     rst_file = tmp_path / "example.rst"
     content = """\
     .. code-block:: python
@@ -222,11 +327,10 @@ def test_multiple_code_blocks(tmp_path: Path) -> None:
     assert result.stderr == ""
 
 
-def test_language_filters(tmp_path: Path) -> None:
+def test_language_filters(tmp_path: Path, runner: CliRunner) -> None:
     """
     Languages not specified are not run.
     """
-    runner = CliRunner(mix_stderr=False)
     rst_file = tmp_path / "example.rst"
     content = """\
     .. code-block:: python
@@ -253,39 +357,24 @@ def test_language_filters(tmp_path: Path) -> None:
         catch_exceptions=False,
     )
     assert result.exit_code == 0, (result.stdout, result.stderr)
-    expected_output = textwrap.dedent(
-        text="""\
-
-
-        x = 2 + 2
-        assert x == 4
-        """,
-    )
-
-    assert result.stdout == expected_output
+    assert result.stdout == _PYTHON_BLOCK_PADDED_OUTPUT
     assert result.stderr == ""
 
 
-def test_run_command_no_pad_file(tmp_path: Path) -> None:
+def test_run_command_no_pad_file(
+    python_block_rst_file: Path,
+    runner: CliRunner,
+) -> None:
     """
     It is possible to not pad the file.
     """
-    runner = CliRunner(mix_stderr=False)
-    rst_file = tmp_path / "example.rst"
-    content = """\
-    .. code-block:: python
-
-        x = 2 + 2
-        assert x == 4
-    """
-    rst_file.write_text(data=content, encoding="utf-8")
     arguments = [
         "--language",
         "python",
         "--command",
         "cat",
         "--no-pad-file",
-        str(object=rst_file),
+        str(object=python_block_rst_file),
     ]
     result = runner.invoke(
         cli=main,
@@ -304,11 +393,10 @@ def test_run_command_no_pad_file(tmp_path: Path) -> None:
     assert result.stderr == ""
 
 
-def test_multiple_files(tmp_path: Path) -> None:
+def test_multiple_files(tmp_path: Path, runner: CliRunner) -> None:
     """
     It is possible to run a command against multiple files.
     """
-    runner = CliRunner(mix_stderr=False)
     rst_file1 = tmp_path / "example1.rst"
     rst_file2 = tmp_path / "example2.rst"
     content1 = """\
@@ -356,12 +444,14 @@ def test_multiple_files(tmp_path: Path) -> None:
     assert result.stderr == ""
 
 
-def test_multiple_files_multiple_types(tmp_path: Path) -> None:
+def test_multiple_files_multiple_types(
+    tmp_path: Path,
+    runner: CliRunner,
+) -> None:
     """
     It is possible to run a command against multiple files of multiple types
     (Markdown and rST).
     """
-    runner = CliRunner(mix_stderr=False)
     rst_file = tmp_path / "example.rst"
     md_file = tmp_path / "example.md"
     rst_content = """\
@@ -417,11 +507,10 @@ def test_multiple_files_multiple_types(tmp_path: Path) -> None:
     assert result.stderr == ""
 
 
-def test_modify_file(tmp_path: Path) -> None:
+def test_modify_file(tmp_path: Path, runner: CliRunner) -> None:
     """
     Commands can modify files.
     """
-    runner = CliRunner(mix_stderr=False)
     rst_file = tmp_path / "example.rst"
     content = """\
     .. code-block:: python
@@ -465,11 +554,10 @@ def test_modify_file(tmp_path: Path) -> None:
     assert modified_content == expected_modified_content
 
 
-def test_exit_code(tmp_path: Path) -> None:
+def test_exit_code(tmp_path: Path, runner: CliRunner) -> None:
     """
     The exit code of the first failure is propagated.
     """
-    runner = CliRunner(mix_stderr=False)
     rst_file = tmp_path / "example.rst"
     exit_code = 25
     content = f"""\
@@ -483,7 +571,7 @@ def test_exit_code(tmp_path: Path) -> None:
         "--language",
         "python",
         "--command",
-        Path(sys.executable).as_posix(),
+        _PYTHON_EXECUTABLE,
         str(object=rst_file),
     ]
     result = runner.invoke(
@@ -499,17 +587,20 @@ def test_exit_code(tmp_path: Path) -> None:
     argvalues=[
         ("python", ".py"),
         ("javascript", ".js"),
+        ("unknown", ".txt"),
     ],
+    ids=["python", "javascript", "unknown"],
 )
 def test_file_extension(
     tmp_path: Path,
     language: str,
     expected_extension: str,
+    runner: CliRunner,
 ) -> None:
     """
-    The file extension of the temporary file is appropriate for the language.
+    The file extension of the temporary file is appropriate for the language,
+    or `.txt` for any unknown language.
     """
-    runner = CliRunner(mix_stderr=False)
     rst_file = tmp_path / "example.rst"
     content = f"""\
     .. code-block:: {language}
@@ -536,19 +627,13 @@ def test_file_extension(
     assert output_path.suffix == expected_extension
 
 
-def test_given_temporary_file_extension(tmp_path: Path) -> None:
+def test_given_temporary_file_extension(
+    python_block_rst_file: Path,
+    runner: CliRunner,
+) -> None:
     """
     It is possible to specify the file extension for created temporary files.
     """
-    runner = CliRunner(mix_stderr=False)
-    rst_file = tmp_path / "example.rst"
-    content = """\
-    .. code-block:: python
-
-        x = 2 + 2
-        assert x == 4
-    """
-    rst_file.write_text(data=content, encoding="utf-8")
     arguments = [
         "--language",
         "python",
@@ -556,7 +641,7 @@ def test_given_temporary_file_extension(tmp_path: Path) -> None:
         ".foobar",
         "--command",
         "echo",
-        str(object=rst_file),
+        str(object=python_block_rst_file),
     ]
     result = runner.invoke(
         cli=main,
@@ -570,21 +655,13 @@ def test_given_temporary_file_extension(tmp_path: Path) -> None:
 
 
 def test_given_temporary_file_extension_no_leading_period(
-    tmp_path: Path,
+    python_block_rst_file: Path,
+    runner: CliRunner,
 ) -> None:
     """
     An error is shown when a given temporary file extension is given with no
     leading period.
     """
-    runner = CliRunner(mix_stderr=False)
-    rst_file = tmp_path / "example.rst"
-    content = """\
-    .. code-block:: python
-
-        x = 2 + 2
-        assert x == 4
-    """
-    rst_file.write_text(data=content, encoding="utf-8")
     arguments = [
         "--language",
         "python",
@@ -592,7 +669,7 @@ def test_given_temporary_file_extension_no_leading_period(
         "foobar",
         "--command",
         "echo",
-        str(object=rst_file),
+        str(object=python_block_rst_file),
     ]
     result = runner.invoke(
         cli=main,
@@ -612,19 +689,10 @@ def test_given_temporary_file_extension_no_leading_period(
     assert result.stderr == expected_stderr
 
 
-def test_given_prefix(tmp_path: Path) -> None:
+def test_given_prefix(python_block_rst_file: Path, runner: CliRunner) -> None:
     """
     It is possible to specify a prefix for the temporary file.
     """
-    runner = CliRunner(mix_stderr=False)
-    rst_file = tmp_path / "example.rst"
-    content = """\
-    .. code-block:: python
-
-        x = 2 + 2
-        assert x == 4
-    """
-    rst_file.write_text(data=content, encoding="utf-8")
     arguments = [
         "--language",
         "python",
@@ -632,7 +700,7 @@ def test_given_prefix(tmp_path: Path) -> None:
         "myprefix",
         "--command",
         "echo",
-        str(object=rst_file),
+        str(object=python_block_rst_file),
     ]
     result = runner.invoke(
         cli=main,
@@ -645,43 +713,10 @@ def test_given_prefix(tmp_path: Path) -> None:
     assert output_path.name.startswith("myprefix_")
 
 
-def test_file_extension_unknown_language(tmp_path: Path) -> None:
-    """
-    The file extension of the temporary file is `.txt` for any unknown
-    language.
-    """
-    runner = CliRunner(mix_stderr=False)
-    rst_file = tmp_path / "example.rst"
-    content = """\
-    .. code-block:: unknown
-
-        x = 2 + 2
-        assert x == 4
-    """
-    rst_file.write_text(data=content, encoding="utf-8")
-    arguments = [
-        "--language",
-        "unknown",
-        "--command",
-        "echo",
-        str(object=rst_file),
-    ]
-    result = runner.invoke(
-        cli=main,
-        args=arguments,
-        catch_exceptions=False,
-    )
-    assert result.exit_code == 0, (result.stdout, result.stderr)
-    output = result.stdout
-    output_path = Path(output.strip())
-    assert output_path.suffix == ".txt"
-
-
-def test_file_given_multiple_times(tmp_path: Path) -> None:
+def test_file_given_multiple_times(tmp_path: Path, runner: CliRunner) -> None:
     """
     Files given multiple times are de-duplicated.
     """
-    runner = CliRunner(mix_stderr=False)
     rst_file = tmp_path / "example.rst"
     other_rst_file = tmp_path / "other_example.rst"
     content = """\
@@ -726,11 +761,10 @@ def test_file_given_multiple_times(tmp_path: Path) -> None:
     assert result.stderr == ""
 
 
-def test_verbose_running(tmp_path: Path) -> None:
+def test_verbose_running(tmp_path: Path, runner: CliRunner) -> None:
     """
     Verbose output is shown showing what is running.
     """
-    runner = CliRunner(mix_stderr=False)
     rst_file = tmp_path / "example.rst"
     content = """\
     .. code-block:: python
@@ -764,14 +798,6 @@ def test_verbose_running(tmp_path: Path) -> None:
         catch_exceptions=False,
     )
     assert result.exit_code == 0, (result.stdout, result.stderr)
-    expected_output = textwrap.dedent(
-        text="""\
-
-
-        x = 2 + 2
-        assert x == 4
-        """,
-    )
     expected_stderr = f"Running 'cat' on code block at {rst_file} line 1\n"
     expected_stderr = textwrap.dedent(
         text=f"""\
@@ -779,16 +805,15 @@ def test_verbose_running(tmp_path: Path) -> None:
         Running 'cat' on code block at {rst_file} line 1
         """,
     )
-    assert result.stdout == expected_output
+    assert result.stdout == _PYTHON_BLOCK_PADDED_OUTPUT
     assert result.stderr == expected_stderr
 
 
-def test_verbose_not_utf_8(tmp_path: Path) -> None:
+def test_verbose_not_utf_8(tmp_path: Path, runner: CliRunner) -> None:
     """
     Verbose output shows what files are being skipped because they are not
     UTF-8.
     """
-    runner = CliRunner(mix_stderr=False)
     rst_file = tmp_path / "example.rst"
     content = """\
     .. code-block:: python
@@ -823,40 +848,37 @@ def test_verbose_not_utf_8(tmp_path: Path) -> None:
     assert result.stderr == expected_stderr
 
 
-def test_main_entry_point() -> None:
+def test_main_entry_point(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
     """
     It is possible to run the main entry point.
     """
-    result = subprocess.run(
-        args=[sys.executable, "-m", "doccmd"],
-        capture_output=True,
-        text=True,
-        check=False,
-    )
-    assert "Usage:" in result.stderr
+    # This is run in-process rather than in a subprocess to avoid the cost
+    # of starting a new interpreter.
+    monkeypatch.setattr(target=sys, name="argv", value=["doccmd"])
+    with pytest.raises(expected_exception=SystemExit):
+        runpy.run_module(mod_name="doccmd", run_name="__main__")
+
+    assert "Usage:" in capsys.readouterr().err
 
 
-def test_command_not_found(tmp_path: Path) -> None:
+def test_command_not_found(
+    python_block_rst_file: Path,
+    runner: CliRunner,
+) -> None:
     """
     An error is shown when the command is not found.
     """
-    runner = CliRunner(mix_stderr=False)
-    rst_file = tmp_path / "example.rst"
     non_existent_command = uuid.uuid4().hex
     non_existent_command_with_args = f"{non_existent_command} --help"
-    content = """\
-    .. code-block:: python
-
-        x = 2 + 2
-        assert x == 4
-    """
-    rst_file.write_text(data=content, encoding="utf-8")
     arguments = [
         "--language",
         "python",
         "--command",
         non_existent_command_with_args,
-        str(object=rst_file),
+        str(object=python_block_rst_file),
     ]
     result = runner.invoke(
         cli=main,
@@ -868,30 +890,25 @@ def test_command_not_found(tmp_path: Path) -> None:
     assert result.stderr.startswith(expected_error)
 
 
-def test_not_executable(tmp_path: Path) -> None:
+def test_not_executable(
+    tmp_path: Path,
+    python_block_rst_file: Path,
+    runner: CliRunner,
+) -> None:
     """
     An error is shown when the command is a non-executable file.
     """
-    runner = CliRunner(mix_stderr=False)
-    rst_file = tmp_path / "example.rst"
     not_executable_command = tmp_path / "non_executable"
     not_executable_command.touch()
     not_executable_command_with_args = (
         f"{not_executable_command.as_posix()} --help"
     )
-    content = """\
-    .. code-block:: python
-
-        x = 2 + 2
-        assert x == 4
-    """
-    rst_file.write_text(data=content, encoding="utf-8")
     arguments = [
         "--language",
         "python",
         "--command",
         not_executable_command_with_args,
-        str(object=rst_file),
+        str(object=python_block_rst_file),
     ]
     result = runner.invoke(
         cli=main,
@@ -906,12 +923,11 @@ def test_not_executable(tmp_path: Path) -> None:
     assert result.stderr.startswith(expected_error)
 
 
-def test_multiple_languages(tmp_path: Path) -> None:
+def test_multiple_languages(tmp_path: Path, runner: CliRunner) -> None:
     """
     It is possible to run a command against multiple code blocks in a document
     with different languages.
     """
-    runner = CliRunner(mix_stderr=False)
     rst_file = tmp_path / "example.rst"
     content = """\
     .. code-block:: python
@@ -954,28 +970,13 @@ def test_multiple_languages(tmp_path: Path) -> None:
     assert result.stderr == ""
 
 
-def test_default_skip_rst(tmp_path: Path) -> None:
+def test_default_skip_rst(tmp_path: Path, runner: CliRunner) -> None:
     """
     By default, the next code block after a 'doccmd skip: next' comment in a
     rST document is not run.
     """
-    runner = CliRunner(mix_stderr=False)
     rst_file = tmp_path / "example.rst"
-    content = """\
-    .. code-block:: python
-
-       block_1
-
-    .. skip doccmd[all]: next
-
-    .. code-block:: python
-
-        block_2
-
-    .. code-block:: python
-
-        block_3
-    """
+    content = _RST_SKIP_NEXT_TEMPLATE.format(skip_marker="all")
     rst_file.write_text(data=content, encoding="utf-8")
     arguments = [
         "--no-pad-file",
@@ -991,40 +992,18 @@ def test_default_skip_rst(tmp_path: Path) -> None:
         catch_exceptions=False,
     )
     assert result.exit_code == 0, (result.stdout, result.stderr)
-    expected_output = textwrap.dedent(
-        text="""\
-        block_1
-        block_3
-        """,
-    )
-
-    assert result.stdout == expected_output
+    assert result.stdout == _SKIP_NEXT_OUTPUT
     assert result.stderr == ""
 
 
-def test_custom_skip_markers_rst(tmp_path: Path) -> None:
+def test_custom_skip_markers_rst(tmp_path: Path, runner: CliRunner) -> None:
     """
     The next code block after a custom skip marker comment in a rST document is
     not run.
     """
-    runner = CliRunner(mix_stderr=False)
     rst_file = tmp_path / "example.rst"
     skip_marker = uuid.uuid4().hex
-    content = f"""\
-    .. code-block:: python
-
-       block_1
-
-    .. skip doccmd[{skip_marker}]: next
-
-    .. code-block:: python
-
-        block_2
-
-    .. code-block:: python
-
-        block_3
-    """
+    content = _RST_SKIP_NEXT_TEMPLATE.format(skip_marker=skip_marker)
     rst_file.write_text(data=content, encoding="utf-8")
     arguments = [
         "--no-pad-file",
@@ -1042,47 +1021,17 @@ def test_custom_skip_markers_rst(tmp_path: Path) -> None:
         catch_exceptions=False,
     )
     assert result.exit_code == 0, (result.stdout, result.stderr)
-    expected_output = textwrap.dedent(
-        text="""\
-        block_1
-        block_3
-        """,
-    )
-
-    assert result.stdout == expected_output
+    assert result.stdout == _SKIP_NEXT_OUTPUT
     assert result.stderr == ""
 
 
-def test_default_skip_myst(tmp_path: Path) -> None:
+def test_default_skip_myst(tmp_path: Path, runner: CliRunner) -> None:
     """
     By default, the next code block after a 'doccmd skip: next' comment in a
     MyST document is not run.
     """
-    runner = CliRunner(mix_stderr=False)
     myst_file = tmp_path / "example.md"
-    content = """\
-    Example
-
-    ```python
-    block_1
-    ```
-
-    <!--- skip doccmd[all]: next -->
-
-    ```python
-    block_2
-    ```
-
-    ```python
-    block_3
-    ```
-
-    % skip doccmd[all]: next
-
-    ```python
-    block_4
-    ```
-    """
+    content = _MYST_SKIP_NEXT_TEMPLATE.format(skip_marker="all")
     myst_file.write_text(data=content, encoding="utf-8")
     arguments = [
         "--no-pad-file",
@@ -1098,48 +1047,18 @@ def test_default_skip_myst(tmp_path: Path) -> None:
         catch_exceptions=False,
     )
     assert result.exit_code == 0, (result.stdout, result.stderr)
-    expected_output = textwrap.dedent(
-        text="""\
-        block_1
-        block_3
-        """,
-    )
-
-    assert result.stdout == expected_output
+    assert result.stdout == _SKIP_NEXT_OUTPUT
     assert result.stderr == ""
 
 
-def test_custom_skip_markers_myst(tmp_path: Path) -> None:
+def test_custom_skip_markers_myst(tmp_path: Path, runner: CliRunner) -> None:
     """
     The next code block after a custom skip marker comment in a MyST document
     is not run.
     """
-    runner = CliRunner(mix_stderr=False)
     myst_file = tmp_path / "example.md"
     skip_marker = uuid.uuid4().hex
-    content = f"""\
-    Example
-
-    ```python
-    block_1
-    ```
-
-    <!--- skip doccmd[{skip_marker}]: next -->
-
-    ```python
-    block_2
-    ```
-
-    ```python
-    block_3
-    ```
-
-    % skip doccmd[{skip_marker}]: next
-
-    ```python
-    block_4
-    ```
-    """
+    content = _MYST_SKIP_NEXT_TEMPLATE.format(skip_marker=skip_marker)
     myst_file.write_text(data=content, encoding="utf-8")
     arguments = [
         "--no-pad-file",
@@ -1157,22 +1076,14 @@ def test_custom_skip_markers_myst(tmp_path: Path) -> None:
         catch_exceptions=False,
     )
     assert result.exit_code == 0, (result.stdout, result.stderr)
-    expected_output = textwrap.dedent(
-        text="""\
-        block_1
-        block_3
-        """,
-    )
-
-    assert result.stdout == expected_output
+    assert result.stdout == _SKIP_NEXT_OUTPUT
     assert result.stderr == ""
 
 
-def test_multiple_skip_markers(tmp_path: Path) -> None:
+def test_multiple_skip_markers(tmp_path: Path, runner: CliRunner) -> None:
     """
     All given skip markers, including the default one, are respected.
     """
-    runner = CliRunner(mix_stderr=False)
     rst_file = tmp_path / "example.rst"
     skip_marker_1 = uuid.uuid4().hex
     skip_marker_2 = uuid.uuid4().hex
@@ -1228,11 +1139,10 @@ def test_multiple_skip_markers(tmp_path: Path) -> None:
     assert result.stderr == ""
 
 
-def test_skip_start_end(tmp_path: Path) -> None:
+def test_skip_start_end(tmp_path: Path, runner: CliRunner) -> None:
     """
     Skip start and end markers are respected.
     """
-    runner = CliRunner(mix_stderr=False)
     rst_file = tmp_path / "example.rst"
     skip_marker_1 = uuid.uuid4().hex
     skip_marker_2 = uuid.uuid4().hex
@@ -1287,11 +1197,10 @@ def test_skip_start_end(tmp_path: Path) -> None:
     assert result.stderr == ""
 
 
-def test_duplicate_skip_marker(tmp_path: Path) -> None:
+def test_duplicate_skip_marker(tmp_path: Path, runner: CliRunner) -> None:
     """
     Duplicate skip markers are respected.
     """
-    runner = CliRunner(mix_stderr=False)
     rst_file = tmp_path / "example.rst"
     skip_marker = uuid.uuid4().hex
     content = f"""\
@@ -1340,11 +1249,10 @@ def test_duplicate_skip_marker(tmp_path: Path) -> None:
     assert result.stderr == ""
 
 
-def test_default_skip_marker_given(tmp_path: Path) -> None:
+def test_default_skip_marker_given(tmp_path: Path, runner: CliRunner) -> None:
     """
     No error is shown when the default skip marker is given.
     """
-    runner = CliRunner(mix_stderr=False)
     rst_file = tmp_path / "example.rst"
     skip_marker = "all"
     content = f"""\
@@ -1391,20 +1299,17 @@ def test_default_skip_marker_given(tmp_path: Path) -> None:
     assert result.stderr == ""
 
 
-def test_empty_file(tmp_path: Path) -> None:
+def test_empty_file(empty_rst_file: Path, runner: CliRunner) -> None:
     """
     No error is shown when an empty file is given.
     """
-    runner = CliRunner(mix_stderr=False)
-    rst_file = tmp_path / "example.rst"
-    rst_file.touch()
     arguments = [
         "--no-pad-file",
         "--language",
         "python",
         "--command",
         "cat",
-        str(object=rst_file),
+        str(object=empty_rst_file),
     ]
     result = runner.invoke(
         cli=main,
@@ -1431,18 +1336,20 @@ def test_detect_line_endings(
     expect_crlf: bool,
     expect_cr: bool,
     expect_lf: bool,
+    runner: CliRunner,
 ) -> None:
     """
     The line endings of the original file are used in the new file.
     """
-    runner = CliRunner(mix_stderr=False)
     rst_file = tmp_path / "example.rst"
     content = """\
     .. code-block:: python
 
        block_1
     """
-    rst_file.write_text(data=content, encoding="utf-8", newline=source_newline)
+    translated_content = content.replace("\n", source_newline)
+    content_bytes = translated_content.encode(encoding="utf-8")
+    rst_file.write_bytes(data=content_bytes)
     arguments = [
         "--no-pad-file",
         "--language",
@@ -1458,17 +1365,20 @@ def test_detect_line_endings(
     )
     assert result.exit_code == 0, (result.stdout, result.stderr)
     assert result.stderr == ""
-    assert bool(b"\r\n" in result.stdout_bytes) == expect_crlf
-    assert bool(b"\r" in result.stdout_bytes) == expect_cr
-    assert bool(b"\n" in result.stdout_bytes) == expect_lf
+    stdout_bytes = result.stdout_bytes
+    assert (b"\r\n" in stdout_bytes) == expect_crlf
+    assert (b"\r" in stdout_bytes) == expect_cr
+    assert (b"\n" in stdout_bytes) == expect_lf
 
 
-def test_one_supported_markup_in_another_extension(tmp_path: Path) -> None:
+def test_one_supported_markup_in_another_extension(
+    tmp_path: Path,
+    runner: CliRunner,
+) -> None:
     """
     Code blocks in a supported markup language in a file with an extension
     which matches another extension are not run.
     """
-    runner = CliRunner(mix_stderr=False)
     rst_file = tmp_path / "example.rst"
     content = """\
     ```python
@@ -1502,17 +1412,35 @@ def test_one_supported_markup_in_another_extension(tmp_path: Path) -> None:
 @pytest.mark.parametrize(argnames="extension", argvalues=[".unknown", ""])
 def test_unknown_file_suffix(extension: str, tmp_path: Path) -> None:
     """
-    An error is shown when the file suffix is not known.
+    A usage error naming the file is raised when the file suffix is not known.
     """
-    runner = CliRunner(mix_stderr=False)
     document_file = tmp_path / ("example" + extension)
-    content = """\
-    .. code-block:: python
+    document_file.write_text(data=_PYTHON_BLOCK_RST_CONTENT, encoding="utf-8")
+    arguments = [
+        "--language",
+        "python",
+        "--command",
+        "cat",
+        str(object=document_file),
+    ]
+    # We do not use the runner here so that Click raises the error rather
+    # than formatting a usage message for it.
+    with pytest.raises(expected_exception=click.UsageError) as exc_info:
+        main.main(args=arguments, standalone_mode=False)
 
-        x = 2 + 2
-        assert x == 4
+    expected_message = f"Markup language not known for {document_file}."
+    assert exc_info.value.message == expected_message
+
+
+def test_unknown_file_suffix_usage_message(
+    tmp_path: Path,
+    runner: CliRunner,
+) -> None:
+    """
+    A usage message is shown when the file suffix is not known.
     """
-    document_file.write_text(data=content, encoding="utf-8")
+    document_file = tmp_path / "example.unknown"
+    document_file.write_text(data=_PYTHON_BLOCK_RST_CONTENT, encoding="utf-8")
     arguments = [
         "--language",
         "python",
@@ -1539,85 +1467,58 @@ def test_unknown_file_suffix(extension: str, tmp_path: Path) -> None:
     assert result.stderr == expected_stderr
 
 
-def test_custom_rst_file_suffixes(tmp_path: Path) -> None:
-    """
-    ReStructuredText files with custom suffixes are recognized.
-    """
-    runner = CliRunner(mix_stderr=False)
-    rst_file = tmp_path / "example.customrst"
-    content = """\
-    .. code-block:: python
-
-        x = 1
-    """
-    rst_file.write_text(data=content, encoding="utf-8")
-    rst_file_2 = tmp_path / "example.customrst2"
-    content_2 = """\
+@pytest.mark.parametrize(
+    argnames=("option", "suffix", "content_template"),
+    argvalues=[
+        (
+            "--rst-extension",
+            ".customrst",
+            """\
     .. code-block:: python
 
-        x = 2
-    """
-    rst_file_2.write_text(data=content_2, encoding="utf-8")
-    arguments = [
-        "--no-pad-file",
-        "--language",
-        "python",
-        "--command",
-        "cat",
-        "--rst-extension",
-        ".customrst",
-        "--rst-extension",
-        ".customrst2",
-        str(object=rst_file),
-        str(object=rst_file_2),
-    ]
-    result = runner.invoke(
-        cli=main,
-        args=arguments,
-        catch_exceptions=False,
-    )
-    expected_output = textwrap.dedent(
-        text="""\
-        x = 1
-        x = 2
-        """,
-    )
-    assert result.exit_code == 0, (result.stdout, result.stderr)
-    assert result.stdout == expected_output
-    assert result.stderr == ""
-
-
-def test_custom_myst_file_suffixes(tmp_path: Path) -> None:
-    """
-    MyST files with custom suffixes are recognized.
-    """
-    runner = CliRunner(mix_stderr=False)
-    myst_file = tmp_path / "example.custommyst"
-    content = """\
+        x = {value}
+    """,
+        ),
+        (
+            "--myst-extension",
+            ".custommyst",
+            """\
     ```python
-    x = 1
+    x = {value}
     ```
+    """,
+        ),
+    ],
+    ids=["rst", "myst"],
+)
+def test_custom_file_suffixes(
+    tmp_path: Path,
+    option: str,
+    suffix: str,
+    content_template: str,
+    runner: CliRunner,
+) -> None:
     """
-    myst_file.write_text(data=content, encoding="utf-8")
-    myst_file_2 = tmp_path / "example.custommyst2"
-    content_2 = """\
-    ```python
-    x = 2
-    ```
+    Files with custom suffixes are recognized.
     """
-    myst_file_2.write_text(data=content_2, encoding="utf-8")
+    source_file = tmp_path / f"example{suffix}"
+    content = content_template.format(value=1)
+    source_file.write_text(data=content, encoding="utf-8")
+    source_file_2 = tmp_path / f"example{suffix}2"
+    content_2 = content_template.format(value=2)
+    source_file_2.write_text(data=content_2, encoding="utf-8")
     arguments = [
         "--no-pad-file",
         "--language",
         "python",
         "--command",
         "cat",
-        "--myst-extension",
-        ".custommyst",
-        "--myst-extension",
-        ".custommyst2",
-        str(object=myst_file),
-        str(object=myst_file_2),
+        option,
+        suffix,
+        option,
+        f"{suffix}2",
+        str(object=source_file),
+        str(object=source_file_2),
     ]
     result = runner.invoke(
         cli=main,
@@ -1651,25 +1552,13 @@ def test_pty(
     tmp_path: Path,
     options: Sequence[str],
     expected_output: str,
+    tty_test_script: Path,
+    runner: CliRunner,
 ) -> None:
     """
     Test options for using pseudo-terminal.
     """
-    runner = CliRunner(mix_stderr=False)
     rst_file = tmp_path / "example.rst"
-    tty_test = textwrap.dedent(
-        text="""\
-        import sys
-
-        if sys.stdout.isatty():
-            print("stdout is a terminal.")
-        else:
-            print("stdout is not a terminal.")
-        """,
-    )
-    script = tmp_path / "my_script.py"
-    script.write_text(data=tty_test)
-    script.chmod(mode=stat.S_IRUSR | stat.S_IWUSR | stat.S_IXUSR)
     content = """\
     .. code-block:: python
 
@@ -1682,7 +1571,7 @@ def test_pty(
         "--language",
         "python",
         "--command",
-        f"{Path(sys.executable).as_posix()} {script.as_posix()}",
+        f"{_PYTHON_EXECUTABLE} {tty_test_script.as_posix()}",
         str(object=rst_file),
     ]
     result = runner.invoke(
@@ -1700,17 +1589,14 @@ def test_pty(
     argvalues=["--rst-extension", "--myst-extension"],
 )
 def test_source_given_extension_no_leading_period(
-    tmp_path: Path,
+    empty_rst_file: Path,
     option: str,
+    runner: CliRunner,
 ) -> None:
     """
     An error is shown when a given source file extension is given with no
     leading period.
     """
-    runner = CliRunner(mix_stderr=False)
-    source_file = tmp_path / "example.rst"
-    content = "Hello world"
-    source_file.write_text(data=content, encoding="utf-8")
     arguments = [
         "--language",
         "python",
@@ -1718,7 +1604,7 @@ def test_source_given_extension_no_leading_period(
         "cat",
         option,
         "customrst",
-        str(object=source_file),
+        str(object=empty_rst_file),
     ]
     result = runner.invoke(
         cli=main,
@@ -1738,19 +1624,13 @@ def test_source_given_extension_no_leading_period(
     assert result.stderr == expected_stderr
 
 
-def test_overlapping_extensions(tmp_path: Path) -> None:
+def test_overlapping_extensions(tmp_path: Path, runner: CliRunner) -> None:
     """
     An error is shown if there are overlapping extensions between --rst-
     extension and --myst-extension.
     """
-    runner = CliRunner(mix_stderr=False)
     source_file = tmp_path / "example.custom"
-    content = """\
-    .. code-block:: python
-
-        x = 1
-    """
-    source_file.write_text(data=content, encoding="utf-8")
+    source_file.write_text(data=_X_EQUALS_1_RST_CONTENT, encoding="utf-8")
     arguments = [
         "--language",
         "python",
@@ -1784,18 +1664,12 @@ def test_overlapping_extensions(tmp_path: Path) -> None:
     assert result.stderr == expected_stderr
 
 
-def test_overlapping_extensions_dot(tmp_path: Path) -> None:
+def test_overlapping_extensions_dot(tmp_path: Path, runner: CliRunner) -> None:
     """
     No error is shown if multiple extension types are '.'.
     """
-    runner = CliRunner(mix_stderr=False)
     source_file = tmp_path / "example.custom"
-    content = """\
-    .. code-block:: python
-
-        x = 1
-    """
-    source_file.write_text(data=content, encoding="utf-8")
+    source_file.write_text(data=_X_EQUALS_1_RST_CONTENT, encoding="utf-8")
     arguments = [
         "--language",
         "python",
@@ -1825,11 +1699,10 @@ def test_overlapping_extensions_dot(tmp_path: Path) -> None:
     assert result.stderr == ""
 
 
-def test_markdown(tmp_path: Path) -> None:
+def test_markdown(tmp_path: Path, runner: CliRunner) -> None:
     """
     It is possible to run a command against a Markdown file.
     """
-    runner = CliRunner(mix_stderr=False)
     source_file = tmp_path / "example.md"
     content = """\
     % skip doccmd[all]: next
@@ -1887,11 +1760,10 @@ def test_markdown(tmp_path: Path) -> None:
     assert result.stderr == ""
 
 
-def test_directory(tmp_path: Path) -> None:
+def test_directory(tmp_path: Path, runner: CliRunner) -> None:
     """
     All source files in a given directory are worked on.
     """
-    runner = CliRunner(mix_stderr=False)
     rst_file = tmp_path / "example.rst"
     rst_content = """\
     .. code-block:: python
@@ -1948,12 +1820,14 @@ def test_directory(tmp_path: Path) -> None:
     assert result.stderr == ""
 
 
-def test_de_duplication_source_files_and_dirs(tmp_path: Path) -> None:
+def test_de_duplication_source_files_and_dirs(
+    tmp_path: Path,
+    runner: CliRunner,
+) -> None:
     """
     If a file is given which is within a directory that is also given, the file
     is de-duplicated.
     """
-    runner = CliRunner(mix_stderr=False)
     rst_file = tmp_path / "example.rst"
     rst_content = """\
     .. code-block:: python
@@ -2001,11 +1875,10 @@ def test_de_duplication_source_files_and_dirs(tmp_path: Path) -> None:
     assert result.stderr == ""
 
 
-def test_max_depth(tmp_path: Path) -> None:
+def test_max_depth(tmp_path: Path, runner: CliRunner) -> None:
     """
     The --max-depth option limits the depth of directories to search for files.
     """
-    runner = CliRunner(mix_stderr=False)
     rst_file = tmp_path / "example.rst"
     rst_content = """\
     .. code-block:: python
@@ -2119,12 +1992,14 @@ def test_max_depth(tmp_path: Path) -> None:
     assert result.stderr == ""
 
 
-def test_exclude_files_from_recursed_directories(tmp_path: Path) -> None:
+def test_exclude_files_from_recursed_directories(
+    tmp_path: Path,
+    runner: CliRunner,
+) -> None:
     """
     Files with names matching the exclude pattern are not processed when
     recursing directories.
     """
-    runner = CliRunner(mix_stderr=False)
     rst_file = tmp_path / "example.rst"
     rst_content = """\
     .. code-block:: python
@@ -2181,12 +2056,11 @@ def test_exclude_files_from_recursed_directories(tmp_path: Path) -> None:
     assert result.stderr == ""
 
 
-def test_multiple_exclude_patterns(tmp_path: Path) -> None:
+def test_multiple_exclude_patterns(tmp_path: Path, runner: CliRunner) -> None:
     """
     Files matching any of the exclude patterns are not processed when recursing
     directories.
     """
-    runner = CliRunner(mix_stderr=False)
     rst_file = tmp_path / "example.rst"
     rst_content = """\
     .. code-block:: python
@@ -2253,11 +2127,10 @@ def test_multiple_exclude_patterns(tmp_path: Path) -> None:
     assert result.stderr == ""
 
 
-def test_lexing_exception(tmp_path: Path) -> None:
+def test_lexing_exception(tmp_path: Path, runner: CliRunner) -> None:
     """
     Lexing exceptions are handled when an invalid source file is given.
     """
-    runner = CliRunner(mix_stderr=False)
     source_file = tmp_path / "invalid_example.md"
     # Lexing error as there is a hyphen in the comment
     # or... because of the word code!